@@ -1,10 +1,16 @@
 import collections.abc
 import json
-import types
+import math
+import re
 import typing
 
 import charm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _JSON = typing.Union[
     typing.Mapping[str, "_JSON"],
     typing.Sequence["_JSON"],
@@ -27,8 +33,162 @@ _ReadWriteJSON = typing.Union[
 ]
 
 
-class _Databag(typing.Mapping[str, _JSON]):
-    _EXCLUDED_KEYS = ("egress-subnets", "ingress-address", "private-address")
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+# Module-level aliases avoid an attribute lookup on `collections.abc` for each call
+_MAPPING = collections.abc.Mapping
+_MUTABLE_MAPPING = collections.abc.MutableMapping
+_SEQUENCE = collections.abc.Sequence
+
+
+def _default(o, /):
+    """Convert `Mapping` (that is not a `dict`) to `dict` and `Sequence` to `list`"""
+    type_ = _container_type(o)
+    if type_ is dict:
+        return dict(o)
+    if type_ is list:
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+# `json.dumps()` creates a new `json.JSONEncoder` on every call if `default` is passed
+_json_dumps = json.JSONEncoder(default=_default).encode
+
+
+def _json_key(key, /) -> str:
+    """Convert `dict` key to `str` the same way as `json.dumps()`
+
+    So that a value in memory has the same keys as the value decoded from the databag
+    """
+    if type(key) is str:
+        return key
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is None or isinstance(key, (int, float)):
+        # Including `bool`
+        return _json_dumps(key)
+    raise TypeError(
+        f"keys must be str, int, float, bool or None, not {type(key).__name__}"
+    )
+
+if orjson is not None:
+    # Integer that may not fit in 64 bits (e.g. below -2**63, which has 19 digits).
+    # `orjson.loads()` converts it to `float`
+    _LONG_INTEGER = re.compile(r"\d{19}")
+    # `orjson` raises on nesting deeper than 255
+    _ORJSON_MAX_DEPTH = 254
+    # Types that `orjson` would encode but `json` rejects raise instead
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def _is_orjson_compatible(value, /, *, int_keys: bool) -> bool:
+        """Whether `orjson` encodes `value` the same as `json`
+
+        `value` must only contain `dict`, `list`, `tuple`, `str`, `int`, finite `float`,
+        `bool`, and `None` (exact types). `orjson` encodes other types that `json` rejects
+        (e.g. `UUID` or `Enum`) and encodes `NaN` and `Infinity` as `null`
+
+        Keys must be `str` (or `int`, if `int_keys`)
+        """
+        type_ = type(value)
+        if type_ is float:
+            return math.isfinite(value)
+        if type_ in _SCALAR_TYPES:
+            return True
+        if type_ is not dict and type_ is not list and type_ is not tuple:
+            return False
+        stack = [(value, 0)]
+        while stack:
+            container, depth = stack.pop()
+            if type(container) is dict:
+                for key in container:
+                    if type(key) is not str and not (int_keys and type(key) is int):
+                        return False
+                children = container.values()
+            else:
+                children = container
+            for child in children:
+                type_ = type(child)
+                if type_ is dict or type_ is list or type_ is tuple:
+                    if depth == _ORJSON_MAX_DEPTH:
+                        # Also stops on circular references
+                        return False
+                    stack.append((child, depth + 1))
+                elif type_ is float:
+                    if not math.isfinite(child):
+                        return False
+                elif type_ not in _SCALAR_TYPES:
+                    return False
+        return True
+
+    def _orjson_loads(raw: str, /):
+        """Decode with `orjson`; fall back to `json` for values `orjson` does not support
+
+        So that data written with `json` (e.g. by another unit without `orjson`) is decoded
+        the same
+        """
+        if _LONG_INTEGER.search(raw) is None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # e.g. `NaN` or `Infinity`
+                pass
+        return json.loads(raw)
+
+    def _orjson_dumps(value, /) -> str:
+        """Encode with `orjson`; fall back to `json` for values `orjson` does not support"""
+        type_ = type(value)
+        # Skip checking `_MutableMapping` and `_MutableSequence`, since their nested values were
+        # already converted by `_copy()` (except `NaN` and `Infinity`)
+        wrapper = type_ is _MutableMapping or type_ is _MutableSequence
+        if not wrapper and not _is_orjson_compatible(value, int_keys=True):
+            return _json_dumps(value)
+        try:
+            encoded = orjson.dumps(value, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integer larger than 64 bits
+            return _json_dumps(value)
+        if wrapper and b"null" in encoded:
+            # `orjson` encodes `NaN` and `Infinity` as `null`
+            return _json_dumps(value)
+        # Databag values are `str`; `orjson.dumps()` returns `bytes`
+        return encoded.decode()
+
+    _loads = _orjson_loads
+    _dumps = _orjson_dumps
+else:
+    _loads = json.loads
+    _dumps = _json_dumps
+
+
+def _raise_immutable(self, *args, **kwargs):
+    raise TypeError(f"{repr(type(self).__name__)} object is immutable")
+
+
+class _FrozenDict(dict):
+    """`dict` that cannot be mutated
+
+    Used instead of `types.MappingProxyType` so that lookups are not forwarded through a proxy
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _raise_immutable
+    clear = pop = popitem = setdefault = update = _raise_immutable
+
+
+class _Databag:
+    """Read-only `Mapping` of databag values
+
+    Implements the `Mapping` methods directly instead of subclassing `typing.Mapping`, whose
+    methods are implemented in Python on top of `__getitem__`
+    """
+
+    __slots__ = ("_databag", "_cache")
+
+    _EXCLUDED_KEYS = frozenset(("egress-subnets", "ingress-address", "private-address"))
     """Keys set by Juju
     
     These values are not JSON-encoded
@@ -36,37 +196,59 @@ class _Databag(typing.Mapping[str, _JSON]):
 
     def __init__(self, databag: typing.Mapping[str, str], /):
         self._databag = databag
+        self._cache: typing.Dict[str, typing.Tuple[str, typing.Any]] = {}
+        """Decoded value & the raw JSON string it was decoded from, by key"""
 
     def __repr__(self):
         return f"{type(self).__name__}({repr(self._databag)})"
 
-    @classmethod
-    def _freeze(cls, data, /) -> _JSON:
-        """Recursively convert output of `json.loads()` to "immutable" types
+    @staticmethod
+    def _freeze(data, /) -> _JSON:
+        """Convert output of `json.loads()` to immutable types
 
-        `types.MappingProxyType` is not technically immutable, but for this purpose it is
-        effectively immutable
+        `data` is modified in place
         """
-        if (
-            isinstance(data, str)
-            or isinstance(data, int)
-            or isinstance(data, float)
-            or isinstance(data, bool)
-            or data is None
-        ):
+        if type(data) is not dict and type(data) is not list:
+            # `json.loads()` only outputs `dict`, `list`, or immutable types
             return data
-        if isinstance(data, collections.abc.MutableMapping):
-            return types.MappingProxyType(
-                {key: cls._freeze(value) for key, value in data.items()}
-            )
-        if isinstance(data, collections.abc.MutableSequence):
-            return tuple(cls._freeze(value) for value in data)
-        raise TypeError
+        root = [data]
+        stack = [(data, root, 0)]
+        # (container, parent, key) in pre-order (each container is before its children)
+        containers = []
+        while stack:
+            item = stack.pop()
+            containers.append(item)
+            container = item[0]
+            for key, value in (
+                container.items() if type(container) is dict else enumerate(container)
+            ):
+                if type(value) is dict or type(value) is list:
+                    stack.append((value, container, key))
+        # Freeze children before their parent so that the parent is still mutable
+        for container, parent, key in reversed(containers):
+            if type(container) is dict:
+                parent[key] = _FrozenDict(container)
+            else:
+                parent[key] = tuple(container)
+        return root[0]
+
+    def _decode(self, key: str, raw: str, /):
+        return self._freeze(_loads(raw))
+
+    def _cached_decode(self, key: str, /):
+        """Decode value of `key`, skipping `json.loads()` if the raw value has not changed"""
+        raw = self._databag[key]
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        value = self._decode(key, raw)
+        self._cache[key] = (raw, value)
+        return value
 
     def __getitem__(self, key: str):
         if key in self._EXCLUDED_KEYS:
             return self._databag[key]
-        return self._freeze(json.loads(self._databag[key]))
+        return self._cached_decode(key)
 
     def __iter__(self):
         return iter(self._databag.keys())
@@ -74,9 +256,47 @@ class _Databag(typing.Mapping[str, _JSON]):
     def __len__(self):
         return len(self._databag)
 
+    def __contains__(self, key):
+        return key in self._databag
 
-class _MutableMapping(typing.MutableMapping[str, _ReadWriteJSON]):
-    """Updates `parent` collection when mutated"""
+    def keys(self):
+        return self._databag.keys()
+
+    # Views decode values lazily on iteration (like `dict.items()` and `dict.values()`)
+    def items(self):
+        return collections.abc.ItemsView(self)
+
+    def values(self):
+        return collections.abc.ValuesView(self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        if not isinstance(other, _MAPPING):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+
+collections.abc.Mapping.register(_Databag)
+
+
+class _MutableMapping(dict):
+    """Updates `parent` collection when mutated
+
+    Subclass of `dict` so that `json` and `orjson` can encode it without a `default` function
+
+    Nested collections are stored as `dict` or `list` until accessed. `dict` methods that
+    would expose those unconverted values are overridden.
+
+    Without `orjson`, `json` calls `items()` when encoding a `dict` subclass, so the first write
+    of a value converts all of its nested collections
+    """
+
+    __slots__ = ("_parent", "_parent_key", "_wrapped")
 
     def __init__(
         self,
@@ -87,28 +307,95 @@ class _MutableMapping(typing.MutableMapping[str, _ReadWriteJSON]):
         parent_key: typing.Union[str, int],
         data: collections.abc.Mapping,
     ):
+        super().__init__(data)
         self._parent = parent
         self._parent_key = parent_key
-        self._data = dict(data)
+        self._wrapped = False
+        """Whether all nested collections have been converted
+
+        Values set after conversion are already converted by `_load()`
+        """
+
+    def _mark_dirty(self, key, value, /):
+        """Called by a nested collection when it is mutated"""
+        self._parent._mark_dirty(self._parent_key, self)
+
+    def _wrap_values(self):
+        if self._wrapped:
+            return
+        self._wrapped = True
+        for key, value in dict.items(self):
+            if type(value) is dict or type(value) is list:
+                dict.__setitem__(
+                    self, key, _wrap(parent=self, parent_key=key, data=value)
+                )
 
     def __getitem__(self, key):
-        return self._data[key]
+        value = dict.__getitem__(self, key)
+        if type(value) is dict or type(value) is list:
+            value = _wrap(parent=self, parent_key=key, data=value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        self._wrap_values()
+        return dict.values(self)
+
+    def __iter__(self):
+        # Overriding `__iter__()` makes `dict(self)` and `{**self}` use `keys()` and
+        # `__getitem__()` instead of copying the unconverted values
+        return dict.__iter__(self)
+
+    def __or__(self, other):
+        return {**self, **other}
+
+    # Copies are plain `dict` (not updated when mutated)
+    def copy(self):
+        return _copy(self)
+
+    def __copy__(self):
+        return _copy(self)
+
+    def __deepcopy__(self, memo):
+        return _copy(self)
+
+    def __reduce__(self):
+        return dict, (_copy(self),)
+
+    def items(self):
+        self._wrap_values()
+        return dict.items(self)
 
     def __setitem__(self, key, value):
-        self._data[key] = _load(parent=self, parent_key=key, data=value)
-        self._parent[self._parent_key] = self
+        key = _json_key(key)
+        dict.__setitem__(self, key, _load(parent=self, parent_key=key, data=value))
+        self._parent._mark_dirty(self._parent_key, self)
 
     def __delitem__(self, key):
-        del self._data[key]
-        self._parent[self._parent_key] = self
+        dict.__delitem__(self, key)
+        self._parent._mark_dirty(self._parent_key, self)
 
-    def __iter__(self):
-        return iter(self._data)
+    # `dict` methods do not call `__getitem__`, `__setitem__`, or `__delitem__`
+    pop = collections.abc.MutableMapping.pop
+    popitem = collections.abc.MutableMapping.popitem
+    update = collections.abc.MutableMapping.update
 
-    def __len__(self):
-        return len(self._data)
+    def clear(self):
+        dict.clear(self)
+        self._parent._mark_dirty(self._parent_key, self)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
 
     def setdefault(self, key, default=None, /):
+        key = _json_key(key)
         try:
             return self[key]
         except KeyError:
@@ -119,8 +406,16 @@ class _MutableMapping(typing.MutableMapping[str, _ReadWriteJSON]):
         return self[key]
 
 
-class _MutableSequence(typing.MutableSequence[_ReadWriteJSON]):
-    """Updates `parent` collection when mutated"""
+class _MutableSequence(list):
+    """Updates `parent` collection when mutated
+
+    Subclass of `list` so that `json` and `orjson` can encode it without a `default` function
+
+    Nested collections are stored as `dict` or `list` until accessed. `list` methods that
+    would expose those unconverted values are overridden.
+    """
+
+    __slots__ = ("_parent", "_parent_key", "_wrapped")
 
     def __init__(
         self,
@@ -129,46 +424,247 @@ class _MutableSequence(typing.MutableSequence[_ReadWriteJSON]):
         parent_key: typing.Union[str, int],
         data: collections.abc.Sequence,
     ):
+        super().__init__(data)
         self._parent = parent
         self._parent_key = parent_key
-        self._data = list(data)
+        self._wrapped = False
+        """Whether all nested collections have been converted
+
+        Values set after conversion are already converted by `_load()`
+        """
+
+    def _mark_dirty(self, key, value, /):
+        """Called by a nested collection when it is mutated
+
+        `key` is not used, so the `_parent_key` of nested collections is not updated when their
+        index changes (e.g. on `insert()` or `del`)
+        """
+        self._parent._mark_dirty(self._parent_key, self)
+
+    def _wrap_values(self):
+        if self._wrapped:
+            return
+        self._wrapped = True
+        for index, value in enumerate(list.__iter__(self)):
+            if type(value) is dict or type(value) is list:
+                list.__setitem__(
+                    self, index, _wrap(parent=self, parent_key=index, data=value)
+                )
 
     def __getitem__(self, key):
-        return self._data[key]
+        if type(key) is slice:
+            return [self[index] for index in range(*key.indices(len(self)))]
+        value = list.__getitem__(self, key)
+        if type(value) is dict or type(value) is list:
+            if key < 0:
+                key += len(self)
+            value = _wrap(parent=self, parent_key=key, data=value)
+            list.__setitem__(self, key, value)
+        return value
+
+    def __iter__(self):
+        self._wrap_values()
+        return list.__iter__(self)
+
+    def __reversed__(self):
+        self._wrap_values()
+        return list.__reversed__(self)
+
+    def __add__(self, other):
+        return [*self, *other]
+
+    def __radd__(self, other):
+        return [*other, *self]
+
+    def __mul__(self, value):
+        return [*self] * value
+
+    __rmul__ = __mul__
+
+    # Copies are plain `list` (not updated when mutated)
+    def copy(self):
+        return _copy(self)
+
+    def __copy__(self):
+        return _copy(self)
+
+    def __deepcopy__(self, memo):
+        return _copy(self)
+
+    def __reduce__(self):
+        return list, (_copy(self),)
 
     def __setitem__(self, key, value):
-        self._data[key] = _load(parent=self, parent_key=key, data=value)
-        self._parent[self._parent_key] = self
+        if type(key) is slice:
+            value = [
+                _load(parent=self, parent_key=index, data=item)
+                for index, item in enumerate(value, key.indices(len(self))[0])
+            ]
+        else:
+            value = _load(parent=self, parent_key=key, data=value)
+        list.__setitem__(self, key, value)
+        self._parent._mark_dirty(self._parent_key, self)
 
     def __delitem__(self, key):
-        del self._data[key]
-        self._parent[self._parent_key] = self
-
-    def __len__(self):
-        return len(self._data)
+        list.__delitem__(self, key)
+        self._parent._mark_dirty(self._parent_key, self)
 
     def insert(self, index, value):
-        self._data.insert(index, _load(parent=self, parent_key=index, data=value))
-        for index, value in enumerate(self._data):
-            if isinstance(value, _MutableMapping) or isinstance(
-                value, _MutableSequence
-            ):
-                value._parent_key = index
-        self._parent[self._parent_key] = self
+        list.insert(self, index, _load(parent=self, parent_key=index, data=value))
+        self._parent._mark_dirty(self._parent_key, self)
+
+    def append(self, value):
+        list.append(self, _load(parent=self, parent_key=len(self), data=value))
+        self._parent._mark_dirty(self._parent_key, self)
+
+    def extend(self, values):
+        list.extend(
+            self,
+            [
+                _load(parent=self, parent_key=index, data=value)
+                for index, value in enumerate(values, len(self))
+            ],
+        )
+        self._parent._mark_dirty(self._parent_key, self)
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def __imul__(self, value):
+        # Copy each repeated item instead of repeating references to the same nested
+        # collections (like `list.__imul__()`)
+        if value <= 0:
+            list.clear(self)
+        else:
+            list.extend(
+                self,
+                [
+                    _load(parent=self, parent_key=index, data=item)
+                    for index, item in enumerate(
+                        list.copy(self) * (value - 1), len(self)
+                    )
+                ],
+            )
+        self._parent._mark_dirty(self._parent_key, self)
+        return self
+
+    # `list` methods do not call `__getitem__` or `__delitem__`
+    pop = collections.abc.MutableSequence.pop
+    remove = collections.abc.MutableSequence.remove
+
+    def clear(self):
+        list.clear(self)
+        self._parent._mark_dirty(self._parent_key, self)
+
+    def reverse(self):
+        list.reverse(self)
+        self._parent._mark_dirty(self._parent_key, self)
+
+    def sort(self, *, key=None, reverse=False):
+        list.sort(self, key=key, reverse=reverse)
+        self._parent._mark_dirty(self._parent_key, self)
+
+
+def _container_type(data, /) -> typing.Optional[type]:
+    """`dict` for `Mapping`, `list` for `Sequence`, or `None` for immutable types"""
+    type_ = type(data)
+    if type_ in _SCALAR_TYPES:
+        return None
+    if type_ is dict or type_ is list:
+        return type_
+    # Subclasses & other `Mapping` or `Sequence` types (e.g. `tuple`)
+    if isinstance(data, (str, int, float, bool)):
+        return None
+    if isinstance(data, _MAPPING):
+        return dict
+    if isinstance(data, _SEQUENCE):
+        return list
+    raise TypeError(
+        f"Expected type 'str', 'int', 'float', 'bool', 'NoneType', 'Mapping', or 'Sequence'; got {repr(type(data).__name__)}: {repr(data)}"
+    )
 
 
-class _Encoder(json.JSONEncoder):
-    """Convert `_MutableMapping` to `dict` and `_MutableSequence` to `list`
+def _wrap(
+    *,
+    parent: typing.Union["_WriteableDatabag", _MutableMapping, _MutableSequence],
+    parent_key: typing.Union[str, int],
+    data: _JSON,
+) -> _ReadWriteJSON:
+    """Convert `dict` to `_MutableMapping` and `list` to `_MutableSequence`
+
+    `data` must only contain `dict`, `list`, and immutable types (e.g. output of `json.loads()`)
 
-    `json` does not support `collections.abc.Mapping` or `collections.abc.Sequence`
+    Only the outermost collection is converted. Nested collections are converted when they are
+    accessed
     """
+    if type(data) is dict:
+        return _MutableMapping(parent=parent, parent_key=parent_key, data=data)
+    if type(data) is list:
+        return _MutableSequence(parent=parent, parent_key=parent_key, data=data)
+    return data
 
-    def default(self, o):
-        if isinstance(o, _MutableMapping):
-            return o._data
-        if isinstance(o, _MutableSequence):
-            return o._data
-        return super().default(o)
+
+def _copy_with_python(data: _JSON, /):
+    """Deep copy `data`, converting `Mapping` to `dict` and `Sequence` to `list`
+
+    `dict` keys are converted to `str` (like `json.dumps()`)
+    """
+    root = [data]
+    # Copy nested collections with a stack instead of recursing
+    stack = [root]
+    while stack:
+        container = stack.pop()
+        for key, value in (
+            container.items() if type(container) is dict else enumerate(container)
+        ):
+            type_ = _container_type(value)
+            if type_ is None:
+                continue
+            # Copy `_MutableMapping` or `_MutableSequence` without converting nested collections
+            if type_ is dict and isinstance(value, dict):
+                copy = dict.copy(value)
+            elif type_ is list and isinstance(value, list):
+                copy = list.copy(value)
+            else:
+                copy = type_(value)
+            if type_ is dict:
+                for nested_key in copy:
+                    if type(nested_key) is not str:
+                        copy = {
+                            _json_key(key_): value_ for key_, value_ in copy.items()
+                        }
+                        break
+            container[key] = copy
+            stack.append(copy)
+    return root[0]
+
+
+def _copy_with_orjson(data: _JSON, /):
+    """Deep copy `data`, converting `Mapping` to `dict` and `Sequence` to `list`
+
+    `orjson` walks `data` in native code, which is faster than `_copy_with_python()`
+    (`json` is slower)
+
+    Values that `orjson` does not encode the same as `json` (see `_is_orjson_compatible()`)
+    are copied with `_copy_with_python()`, so the result (or `TypeError`) is the same
+    """
+    if not _is_orjson_compatible(data, int_keys=True):
+        return _copy_with_python(data)
+    if type(data) in _SCALAR_TYPES:
+        return data
+    try:
+        encoded = orjson.dumps(data, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        # e.g. integer larger than 64 bits
+        return _copy_with_python(data)
+    return orjson.loads(encoded)
+
+
+if orjson is not None:
+    _copy = _copy_with_orjson
+else:
+    _copy = _copy_with_python
 
 
 def _load(
@@ -182,45 +678,99 @@ def _load(
     `_MutableMapping` and `_MutableSequence` update their parent collection when mutated
 
     Therefore, if any mutation is made to the return value of this function,
-    `_WriteableDatabag.__setitem__()` will be called and that mutation will be written to the
+    `_WriteableDatabag._mark_dirty()` will be called and that mutation will be written to the
     databag
+
+    `data` is copied so that later changes to `data` (by the caller) are not reflected
     """
-    if (
-        isinstance(data, str)
-        or isinstance(data, int)
-        or isinstance(data, float)
-        or isinstance(data, bool)
-        or data is None
-    ):
-        return data
-    if isinstance(data, collections.abc.Mapping):
-        # We need to create `mapping` before we can populate it with correctly typed values,
-        # since any mutable objects inside will need a reference to their parent (`mapping`).
-        mapping = _MutableMapping(parent=parent, parent_key=parent_key, data=data)
-        for key, value in mapping.items():
-            value = _load(parent=mapping, parent_key=key, data=value)
-            # Initial value set should not update parent
-            mapping._data[key] = value
-        return mapping
-    if isinstance(data, collections.abc.Sequence):
-        # We need to create `sequence` before we can populate it with correctly typed values,
-        # since any mutable objects inside will need a reference to their parent (`sequence`).
-        sequence = _MutableSequence(parent=parent, parent_key=parent_key, data=data)
-        for index, value in enumerate(sequence):
-            value = _load(parent=sequence, parent_key=index, data=value)
-            # Initial value set should not update parent
-            sequence._data[index] = value
-        return sequence
-    raise TypeError(
-        f"Expected type 'str', 'int', 'float', 'bool', 'NoneType', 'Mapping', or 'Sequence'; got {repr(type(data).__name__)}: {repr(data)}"
-    )
+    return _wrap(parent=parent, parent_key=parent_key, data=_copy(data))
 
 
 class _WriteableDatabag(_Databag, typing.MutableMapping[str, _ReadWriteJSON]):
+    __slots__ = ("_dirty", "_batch_depth")
+
+    def __init__(self, databag: typing.MutableMapping[str, str], /):
+        super().__init__(databag)
+        self._dirty: typing.Dict[str, _ReadWriteJSON] = {}
+        """Mutated values (by top-level key) that have not been written to the databag"""
+        self._batch_depth = 0
+
+    def __enter__(self):
+        """Write mutations of nested collections to the databag on exit instead of immediately
+
+        If a value is mutated multiple times, it is only JSON-encoded once
+
+        If the outermost `with` block raises an exception, the pending writes are discarded
+
+        See `Relation.__enter__()`
+        """
+        self._batch_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+        if exc_type is None:
+            self._flush()
+        else:
+            self._discard()
+
+    def _discard(self):
+        for key in self._dirty:
+            # Cached value was mutated but not written
+            self._cache.pop(key, None)
+        self._dirty = {}
+
+    def _flush(self):
+        if not self._dirty:
+            return
+        dirty = self._dirty
+        try:
+            encoded = {key: _dumps(value) for key, value in dirty.items()}
+            # Single call in case the databag can write multiple keys at once
+            self._databag.update(encoded)
+        except Exception:
+            self._discard()
+            raise
+        self._dirty = {}
+        for key, value in dirty.items():
+            self._cache[key] = (encoded[key], value)
+
+    def _write(
+        self, key: str, value: typing.Union[_MutableMapping, _MutableSequence], /
+    ):
+        try:
+            raw = _dumps(value)
+            self._databag[key] = raw
+        except Exception:
+            # Cached value was mutated but not written
+            self._cache.pop(key, None)
+            raise
+        # `value` is still the up-to-date decoded value (keys were converted to `str` by
+        # `_MutableMapping.__setitem__()` and `_copy()`)
+        self._cache[key] = (raw, value)
+
+    def _mark_dirty(self, key: str, value, /):
+        """Called by a `_MutableMapping` or `_MutableSequence` value when it is mutated"""
+        if self._batch_depth:
+            self._dirty[key] = value
+        else:
+            self._write(key, value)
+
+    def _decode(self, key: str, raw: str, /):
+        # Since the result is cached, reading a value multiple times returns the same
+        # `_MutableMapping` or `_MutableSequence` (instead of converting it again) until the
+        # value is replaced
+        return _wrap(parent=self, parent_key=key, data=_loads(raw))
+
     def __getitem__(self, key: str):
         if key in self._EXCLUDED_KEYS:
             return self._databag[key]
-        return _load(parent=self, parent_key=key, data=json.loads(self._databag[key]))
+        if key in self._dirty:
+            # Databag is stale until `self._flush()`
+            return self._dirty[key]
+        return self._cached_decode(key)
 
     def __setitem__(self, key: str, value):
         if key in self._EXCLUDED_KEYS:
@@ -229,9 +779,14 @@ class _WriteableDatabag(_Databag, typing.MutableMapping[str, _ReadWriteJSON]):
                     f"{repr(key)} is set by Juju and is not JSON-encoded. It must be set to type 'str', got {repr(type(value).__name__)}: {repr(value)}"
                 )
             self._databag[key] = value
-        self._databag[key] = json.dumps(value, cls=_Encoder)
+            return
+        self._dirty.pop(key, None)
+        self._cache.pop(key, None)
+        self._databag[key] = _dumps(value)
 
     def __delitem__(self, key):
+        self._dirty.pop(key, None)
+        self._cache.pop(key, None)
         del self._databag[key]
 
     def setdefault(self, key, default=None, /):
@@ -246,14 +801,69 @@ class _WriteableDatabag(_Databag, typing.MutableMapping[str, _ReadWriteJSON]):
 
 
 class Relation(charm.Relation, typing.Mapping[str, typing.Mapping[str, _JSON]]):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._databags: typing.Dict[typing.Any, _Databag] = {}
+        """Databag for each unit or app
+
+        Reused so that values decoded by a databag are cached across accesses (e.g. multiple
+        `relation.my_app[...]` calls)
+        """
+        self._batch_depth = 0
+
+    def __enter__(self):
+        """Write mutations of nested values to the databags when the outermost `with` exits
+
+        By default, each mutation of a nested value (e.g.
+        `relation.my_app["foo"]["bar"].append(1)`) JSON-encodes and writes the entire top-level
+        value (`relation.my_app["foo"]`). Inside of `with relation:`, each mutated top-level
+        value is encoded and written once, on exit.
+
+        If the `with` block raises an exception, the pending writes are discarded. If writing to
+        a databag fails, the pending writes of that databag are discarded, the other databags are
+        still written, and the first error is raised.
+
+        Assigning or deleting a top-level key (e.g. `relation.my_app["foo"] = {}`) is always
+        written immediately.
+        """
+        self._batch_depth += 1
+        for databag in self._databags.values():
+            if type(databag) is _WriteableDatabag:
+                databag.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._batch_depth -= 1
+        error = None
+        for databag in self._databags.values():
+            if type(databag) is _WriteableDatabag:
+                try:
+                    databag.__exit__(exc_type, exc_value, traceback)
+                except Exception as exception:
+                    # Exit the remaining databags so that they do not stay in batch mode
+                    if error is None:
+                        error = exception
+        if error is not None:
+            raise error
+
     def __eq__(self, other):
         return isinstance(other, Relation) and super().__eq__(other)
 
     def __getitem__(self, key):
+        try:
+            return self._databags[key]
+        except KeyError:
+            pass
         databag = charm.Relation.__getitem__(self, key)
-        if isinstance(databag, collections.abc.MutableMapping):
-            return _WriteableDatabag(databag)
-        return _Databag(databag)
+        if isinstance(databag, _MUTABLE_MAPPING):
+            databag = _WriteableDatabag(databag)
+            # Databag created inside of `with relation:` block
+            for _ in range(self._batch_depth):
+                databag.__enter__()
+        else:
+            databag = _Databag(databag)
+        self._databags[key] = databag
+        return databag
 
     @property
     def my_unit(self) -> typing.MutableMapping[str, _ReadWriteJSON]:
@@ -292,6 +902,22 @@ class PeerRelation(
 class Endpoint(charm.Endpoint):
     _Relation = Relation
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_relations: typing.Dict[int, Relation] = {}
+        """`Relation` instances from the previous `_relations` call, keyed by relation ID"""
+
+    @property
+    def _relations(self) -> typing.List[Relation]:
+        # Return the same `Relation` instance for a relation on every call, so that its
+        # databags (and their caches) are reused
+        cached_relations = self._cached_relations
+        relations = [
+            cached_relations.get(relation.id, relation) for relation in super()._relations
+        ]
+        self._cached_relations = {relation.id: relation for relation in relations}
+        return relations
+
     @property
     def relation(self) -> typing.Optional[Relation]:
         return super().relation
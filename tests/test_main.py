@@ -0,0 +1,410 @@
+import dataclasses
+import copy
+import datetime
+import enum
+import json
+import math
+import sys
+import uuid
+
+import charm
+import pytest
+
+from charm_json import _main
+
+
+class _CountingDict(dict):
+    """Databag stub that counts writes"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writes = 0
+
+    def __setitem__(self, key, value):
+        self.writes += 1
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        self.writes += 1
+        super().update(*args, **kwargs)
+
+
+class _FailingDict(_CountingDict):
+    """Databag stub that fails to write multiple keys at once"""
+
+    def update(self, *args, **kwargs):
+        raise RuntimeError
+
+
+@pytest.fixture
+def raw():
+    return _CountingDict(
+        {"ingress-address": "10.0.0.1", "foo": json.dumps({"bar": [1, {"baz": 2}]})}
+    )
+
+
+@pytest.fixture
+def databag(raw):
+    return _main._WriteableDatabag(raw)
+
+
+@pytest.fixture
+def relation(monkeypatch, raw):
+    monkeypatch.setattr(charm.Relation, "__init__", lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(charm.Relation, "__getitem__", lambda self, key: raw)
+    return _main.Relation()
+
+
+def test_excluded_key_written_once(raw, databag):
+    databag["ingress-address"] = "10.0.0.2"
+    assert raw["ingress-address"] == "10.0.0.2"
+    assert raw.writes == 1
+    assert databag["ingress-address"] == "10.0.0.2"
+
+
+def test_excluded_key_must_be_str(raw, databag):
+    with pytest.raises(TypeError):
+        databag["ingress-address"] = 1
+    assert raw["ingress-address"] == "10.0.0.1"
+    assert raw.writes == 0
+
+
+def test_relation_reuses_databag(monkeypatch, relation):
+    assert relation["unit/0"] is relation["unit/0"]
+    loads_calls = []
+
+    def loads(raw, /):
+        loads_calls.append(raw)
+        return json.loads(raw)
+
+    monkeypatch.setattr(_main, "_loads", loads)
+    relation["unit/0"]["foo"]
+    relation["unit/0"]["foo"]
+    assert len(loads_calls) == 1
+
+
+def test_cache_invalidated(raw, databag):
+    databag["foo"]
+    raw["foo"] = json.dumps({"bar": []})
+    assert databag["foo"] == {"bar": []}
+    databag["foo"] = {"qux": 1}
+    assert databag["foo"] == {"qux": 1}
+    del databag["foo"]
+    assert "foo" not in databag
+    with pytest.raises(KeyError):
+        databag["foo"]
+
+
+def test_read_only_databag_cache_invalidated():
+    raw = {"foo": "[1]"}
+    databag = _main._Databag(raw)
+    assert databag["foo"] == (1,)
+    raw["foo"] = "[2]"
+    assert databag["foo"] == (2,)
+
+
+class _Enum(enum.Enum):
+    A = 1
+
+
+@dataclasses.dataclass
+class _Dataclass:
+    a: int = 1
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {1: "a"},
+        {"a": 2**70},
+        {"a": -(2**70)},
+        {"a": -(2**63) - 1},
+        {"a": [math.nan, math.inf, -math.inf]},
+        {"a": None, "b": [True, 1.5, "c"], "d": (1, 2)},
+    ],
+)
+def test_orjson_parity(value):
+    pytest.importorskip("orjson")
+    # Compare with `json.dumps()` since `NaN != NaN`
+    encoded = _main._orjson_dumps(value)
+    expected = json.dumps(json.loads(_main._json_dumps(value)))
+    assert json.dumps(json.loads(encoded)) == expected
+    assert json.dumps(_main._orjson_loads(encoded)) == expected
+
+
+@pytest.mark.parametrize("raw", ["-9300000000000000000", "18446744073709551616"])
+def test_orjson_loads_long_integer(raw):
+    pytest.importorskip("orjson")
+    value = _main._orjson_loads(raw)
+    assert type(value) is int
+    assert value == json.loads(raw)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [uuid.UUID(int=1), _Enum.A, datetime.datetime(2024, 1, 1), _Dataclass()],
+)
+def test_orjson_rejects_types_json_rejects(value):
+    pytest.importorskip("orjson")
+    with pytest.raises(TypeError):
+        _main._json_dumps(value)
+    with pytest.raises(TypeError):
+        _main._orjson_dumps(value)
+    with pytest.raises(TypeError):
+        _main._orjson_dumps({"a": [value]})
+
+
+def test_freeze_deeply_nested():
+    depth = sys.getrecursionlimit() * 2
+    data = value = []
+    for _ in range(depth):
+        value.append({"a": []})
+        value = value[0]["a"]
+    frozen = _main._Databag._freeze(data)
+    for _ in range(depth):
+        assert type(frozen) is tuple
+        assert type(frozen[0]) is _main._FrozenDict
+        frozen = frozen[0]["a"]
+    assert frozen == ()
+
+
+def test_nested_values_wrapped_on_access(databag):
+    value = databag["foo"]
+    assert type(value) is _main._MutableMapping
+    assert type(dict.__getitem__(value, "bar")) is list
+    bar = value["bar"]
+    assert type(bar) is _main._MutableSequence
+    assert dict.__getitem__(value, "bar") is bar
+    assert type(list.__getitem__(bar, 1)) is dict
+    assert type(bar[1]) is _main._MutableMapping
+
+
+def test_nested_write_through(raw, databag):
+    databag["foo"]["bar"][1]["baz"] = 3
+    assert json.loads(raw["foo"]) == {"bar": [1, {"baz": 3}]}
+    databag["foo"]["bar"].append([])
+    databag["foo"]["bar"][2].append("a")
+    assert json.loads(raw["foo"]) == {"bar": [1, {"baz": 3}, ["a"]]}
+
+
+def test_batch_writes_once(raw, databag):
+    with databag:
+        databag["foo"]["bar"].append(3)
+        databag["foo"]["qux"] = {}
+        databag["foo"]["qux"]["a"] = 1
+        assert raw.writes == 0
+        assert databag["foo"]["qux"] == {"a": 1}
+    assert raw.writes == 1
+    assert json.loads(raw["foo"]) == {"bar": [1, {"baz": 2}, 3], "qux": {"a": 1}}
+
+
+def test_batch_discarded_on_exception(raw, databag):
+    with pytest.raises(ValueError):
+        with databag:
+            databag["foo"]["bar"].append(3)
+            raise ValueError
+    assert raw.writes == 0
+    assert databag["foo"] == {"bar": [1, {"baz": 2}]}
+
+
+def test_relation_batch(raw, relation):
+    with relation:
+        relation["unit/0"]["foo"]["bar"].append(3)
+        relation["unit/0"]["foo"]["bar"].append(4)
+        assert raw.writes == 0
+    assert raw.writes == 1
+    assert json.loads(raw["foo"]) == {"bar": [1, {"baz": 2}, 3, 4]}
+
+
+def test_relation_batch_discarded_on_exception(raw, relation):
+    with pytest.raises(ValueError):
+        with relation:
+            relation["unit/0"]["foo"]["bar"].append(3)
+            raise ValueError
+    assert raw.writes == 0
+    assert relation["unit/0"]["foo"] == {"bar": [1, {"baz": 2}]}
+
+
+def test_failed_batch_write_not_cached():
+    databag = _main._WriteableDatabag(_FailingDict(foo="[]"))
+    with pytest.raises(RuntimeError):
+        with databag:
+            databag["foo"].append(1)
+    assert databag["foo"] == []
+    # No longer in batch mode
+    databag["foo"].append(2)
+    assert databag["foo"] == [2]
+
+
+def test_relation_exit_exits_every_databag(monkeypatch):
+    raws = {"a": _FailingDict(foo="[]"), "b": _CountingDict(foo="[]")}
+    monkeypatch.setattr(charm.Relation, "__init__", lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(charm.Relation, "__getitem__", lambda self, key: raws[key])
+    relation = _main.Relation()
+    with pytest.raises(RuntimeError):
+        with relation:
+            relation["a"]["foo"].append(1)
+            relation["b"]["foo"].append(1)
+    assert relation["a"]["foo"] == []
+    assert json.loads(raws["b"]["foo"]) == [1]
+    relation["b"]["foo"].append(2)
+    assert json.loads(raws["b"]["foo"]) == [1, 2]
+
+
+@pytest.mark.parametrize("make_copy", [dict, lambda value: {**value}])
+def test_shallow_copy_does_not_leak(raw, databag, make_copy):
+    result = make_copy(databag["foo"])
+    assert type(result) is dict
+    # Nested values are converted (not the unconverted `dict`/`list` storage)
+    assert isinstance(result["bar"], _main._MutableSequence)
+    result["bar"].append(3)
+    assert json.loads(raw["foo"]) == {"bar": [1, {"baz": 2}, 3]}
+
+
+@pytest.mark.parametrize(
+    "make_copy", [lambda value: value.copy(), copy.copy, copy.deepcopy]
+)
+def test_copy_is_detached(raw, databag, make_copy):
+    result = make_copy(databag["foo"])
+    assert result == {"bar": [1, {"baz": 2}]}
+    assert type(result) is dict
+    assert type(result["bar"]) is list
+    assert type(result["bar"][1]) is dict
+    result["bar"].append(3)
+    assert json.loads(raw["foo"]) == {"bar": [1, {"baz": 2}]}
+    assert raw.writes == 0
+
+
+def test_imul_copies_nested_values():
+    raw = {"foo": "[[1]]"}
+    databag = _main._WriteableDatabag(raw)
+    value = databag["foo"]
+    # Wrap nested value
+    value[0]
+    value *= 2
+    value[0].append(2)
+    assert json.loads(raw["foo"]) == [[1, 2], [1]]
+    value *= 0
+    assert raw["foo"] == "[]"
+
+
+def test_insert_then_mutate_nested(raw, databag):
+    bar = databag["foo"]["bar"]
+    baz = bar[1]
+    bar.insert(0, {"qux": []})
+    baz["baz"] = 3
+    bar[0]["qux"].append(1)
+    del bar[1]
+    baz["baz"] = 4
+    assert json.loads(raw["foo"]) == {"bar": [{"qux": [1]}, {"baz": 4}]}
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {1: "a"},
+        {"a": 2**70},
+        {"a": [math.nan, math.inf, -math.inf]},
+        {"a": None, "b": [True, 1.5, "c"], "d": (1, 2)},
+    ],
+)
+def test_orjson_copy_parity(value):
+    pytest.importorskip("orjson")
+    # Compare with `repr()` since `NaN != NaN`
+    assert repr(_main._copy_with_orjson(value)) == repr(_main._copy_with_python(value))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [uuid.UUID(int=1), _Enum.A, datetime.datetime(2024, 1, 1), _Dataclass()],
+)
+def test_copy_rejects_types_json_rejects(value):
+    with pytest.raises(TypeError):
+        _main._copy({"a": [value]})
+    pytest.importorskip("orjson")
+    with pytest.raises(TypeError):
+        _main._copy_with_orjson({"a": [value]})
+
+
+def test_endpoint_reuses_relations(monkeypatch):
+    ids = [1, 2]
+    monkeypatch.setattr(charm.Endpoint, "__init__", lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(
+        charm.Endpoint,
+        "_relations",
+        property(lambda self: [self._Relation(id_) for id_ in ids]),
+    )
+    monkeypatch.setattr(
+        charm.Relation, "__init__", lambda self, id_: setattr(self, "_test_id", id_)
+    )
+    monkeypatch.setattr(
+        charm.Relation, "id", property(lambda self: self._test_id), raising=False
+    )
+    endpoint = _main.Endpoint()
+    first = endpoint._relations
+    assert [relation.id for relation in first] == [1, 2]
+    ids[:] = [2, 3]
+    second = endpoint._relations
+    assert second[0] is first[1]
+    assert second[1].id == 3
+    ids[:] = [1]
+    third = endpoint._relations
+    # Relation 1 departed before the previous call
+    assert third[0] is not first[0]
+    assert third[0].id == 1
+    # Not shared between endpoints
+    assert _main.Endpoint()._cached_relations == {}
+
+
+def test_invalid_key_not_set(raw, databag):
+    value = databag["foo"]
+    with pytest.raises(TypeError):
+        value[(1, 2)] = 1
+    assert (1, 2) not in databag["foo"]
+    assert raw.writes == 0
+
+
+def test_keys_converted_to_str(raw, databag):
+    value = databag["foo"]
+    value[1] = "a"
+    value["qux"] = {2: {None: "b"}}
+    assert value.setdefault(3, "c") == "c"
+    expected = json.loads(raw["foo"])
+    assert value == expected
+    assert value.get(1) is None
+    assert value["1"] == "a"
+    assert _main._WriteableDatabag(raw)["foo"] == expected
+
+
+def test_failed_write_not_cached(monkeypatch, databag):
+    databag["foo"]
+
+    def dumps(value, /):
+        raise RuntimeError
+
+    monkeypatch.setattr(_main, "_dumps", dumps)
+    with pytest.raises(RuntimeError):
+        databag["foo"]["qux"] = 1
+    monkeypatch.undo()
+    assert databag["foo"] == {"bar": [1, {"baz": 2}]}
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda value: value.__setitem__("a", 2),
+        lambda value: value.__delitem__("a"),
+        lambda value: value.__ior__({"b": 2}),
+        lambda value: value.clear(),
+        lambda value: value.pop("a"),
+        lambda value: value.popitem(),
+        lambda value: value.setdefault("b", 2),
+        lambda value: value.update(b=2),
+    ],
+)
+def test_frozen_dict_immutable(mutate):
+    value = _main._Databag({"foo": '{"a": 1}'})["foo"]
+    assert type(value) is _main._FrozenDict
+    with pytest.raises(TypeError):
+        mutate(value)
+    assert value == {"a": 1}